@@ -2,21 +2,30 @@
 import os
 import json
 import time
+import zlib
+import heapq
+import atexit
+import sqlite3
 import random
-import string
+import secrets
 import hashlib
+import orjson
 import requests
 import click
+from selectolax.parser import HTMLParser
+from http.cookiejar import LWPCookieJar
+from requests.adapters import HTTPAdapter
 import colorama
 from colorama import Fore, Style
 from dotenv import load_dotenv
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 import shutil
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 import sys
-from urllib.parse import urljoin
 
 # Initialize colorama
 colorama.init()
@@ -29,21 +38,125 @@ CF_API_BASE = "https://codeforces.com/api/"
 CF_BASE_URL = "https://codeforces.com/"
 CACHE_DIR = Path.home() / ".cfcli" / "cache"
 DEFAULT_TEMPLATE_DIR = Path.home() / ".cfcli" / "templates"
+COOKIE_JAR_FILE = Path.home() / ".cfcli" / "cookiejar"
 CACHE_TTL = 300  # 5 minutes
 
 # Ensure cache directory exists
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Compiled once at import
+_FILENAME_RE = re.compile(r'Contest(\d+)_([A-Z][0-9]?)\.cpp')
+_PROBIDX_RE = re.compile(r'^[A-Z][0-9]?$')
+_SUBID_RE = re.compile(r'submissionId="(\d+)"')
+
+def _extract_csrf(body: bytes) -> Optional[str]:
+    """Pull the CSRF token out of a page body with two bytes.find calls.
+
+    The token always follows this literal meta-tag prefix, so a substring
+    scan on the raw bytes beats a regex and skips the .text decode.
+    """
+    needle = b'name="X-Csrf-Token" content="'
+    i = body.find(needle)
+    if i < 0:
+        return None
+    start = i + len(needle)
+    end = body.find(b'"', start)
+    if end < 0:
+        return None
+    return body[start:end].decode('ascii')
+
+
+# Maps fetch's contest type argument to the API phase bucket
+_PHASE_BY_TYPE = {'upcoming': 'BEFORE', 'running': 'CODING', 'past': 'FINISHED'}
+
+# Column header for the fetch contest table, formatted once
+_FETCH_HEADER = f"{Fore.CYAN}{'ID':<8} {'Name':<50} {'Start Time':<25} {'Duration'}{Style.RESET_ALL}"
+
+
+def _bucket_contests(contests: List[Dict]) -> Dict[str, List[Dict]]:
+    """Index the raw contest.list result by phase, sorted for display.
+
+    Done once when the response is cached, so every fetch within the TTL
+    is an O(limit) slice instead of a full filter + sort.
+    """
+    buckets: Dict[str, List[Dict]] = {"BEFORE": [], "CODING": [], "FINISHED": []}
+    for contest in contests:
+        buckets.setdefault(contest.get('phase', ''), []).append(contest)
+    for phase, bucket in buckets.items():
+        bucket.sort(key=lambda c: c.get('startTimeSeconds', 0), reverse=(phase != 'BEFORE'))
+    return buckets
+
+
+def _parse_submissions(html: str) -> List[Tuple[str, str, str]]:
+    """Extract (submission_id, problem_index, verdict) rows from /contest/my.
+
+    A real DOM walk is O(rows) and tolerates markup changes, unlike the
+    previous DOTALL regex which backtracked across the whole page.
+    """
+    submissions = []
+    tree = HTMLParser(html)
+    for row in tree.css('tr[data-submission-id]'):
+        index_node = row.css_first('[data-problemindex]') or row
+        problem_index = index_node.attributes.get('data-problemindex', '') or ''
+        verdict_node = row.css_first('span.submissionVerdictWrapper') or row
+        verdict = verdict_node.attributes.get('submissionverdict', '') or ''
+        submissions.append((row.attributes.get('data-submission-id', ''), problem_index, verdict))
+    return submissions
+
 
 class CFSession:
     def __init__(self):
         self.handle = os.getenv("CF_HANDLE")
         self.api_key = os.getenv("CF_API_KEY")
         self.api_secret = os.getenv("CF_API_SECRET")
+        # Codeforces secrets are ASCII; encode the '#secret' suffix once
+        # so signing never re-encodes it
+        self._secret_tail = ("#" + (self.api_secret or "")).encode('ascii')
         self.session = requests.Session()
+        # Persist cookies across invocations so repeated commands reuse the
+        # authenticated web session instead of logging in every time
+        self.session.cookies = LWPCookieJar(str(COOKIE_JAR_FILE))
+        if COOKIE_JAR_FILE.exists():
+            try:
+                self.session.cookies.load(ignore_discard=True)
+            except (OSError, ValueError):
+                pass  # Corrupt/stale jar; start with an empty one
+        # Keep a warm connection pool so multiple calls within one command
+        # (e.g. 'generate --all') avoid repeated TCP+TLS handshakes
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+        atexit.register(self._save_cookies)
+        # Single SQLite store instead of one JSON file per cached response:
+        # one indexed SELECT replaces stat() + open() + json.load()
+        # check_same_thread=False lets the startup prefetch thread share
+        # the connection; sqlite's default serialized mode makes that safe
+        self._cache_db = sqlite3.connect(str(CACHE_DIR / "cache.sqlite"),
+                                         isolation_level=None, check_same_thread=False)
+        self._cache_db.execute("PRAGMA journal_mode=WAL")
+        self._cache_db.execute("PRAGMA synchronous=NORMAL")
+        self._cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS kv(key TEXT PRIMARY KEY, ts INTEGER, blob BLOB, "
+            "etag TEXT, last_modified TEXT)")
+        # Upgrade databases created before the validator columns existed
+        for column in ("etag", "last_modified"):
+            try:
+                self._cache_db.execute(f"ALTER TABLE kv ADD COLUMN {column} TEXT")
+            except sqlite3.OperationalError:
+                pass
+        # Hashes of already-submitted sources, to skip duplicate uploads
+        # the server would reject anyway
+        self._cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS submitted(cid INTEGER, idx TEXT, h TEXT, "
+            "PRIMARY KEY(cid, idx, h))")
         self.csrf_token = None
         self.logged_in = False
 
+    def _save_cookies(self) -> None:
+        """Persist session cookies to disk at interpreter exit"""
+        try:
+            self.session.cookies.save(ignore_discard=True)
+        except OSError:
+            pass
+
     def is_authenticated(self) -> bool:
         return self.handle and self.api_key and self.api_secret
 
@@ -52,9 +165,11 @@ class CFSession:
         if not self.is_authenticated():
             raise ValueError("Not authenticated. Please run 'cfcli login' first.")
 
-        # Generate random string for request identification
-        rand = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(6))
-        
+        # Generate random string for request identification; one OS RNG
+        # call instead of six interpreter round-trips, and collision-safe
+        # if the CLI is scripted in parallel
+        rand = secrets.token_hex(3)
+
         # Current Unix time
         current_time = str(int(time.time()))
         
@@ -69,58 +184,101 @@ class CFSession:
 
     def sign_request(self, method: str, params: Dict[str, str]) -> Dict[str, str]:
         """Add API signature to request parameters"""
-        # Sort parameters by key
-        sorted_keys = sorted(params.keys())
-        signature_string = f"{method}?"
-        
-        # Construct signature string
-        for key in sorted_keys:
-            signature_string += f"{key}={params[key]}&"
-        
-        # Remove trailing '&' and append API secret
-        signature_string = signature_string.rstrip('&') + f"#{self.api_secret}"
-        
+        # Build the signature string as bytes in one pass; repeated string
+        # concatenation is quadratic and sha512 wants bytes anyway
+        parts = [f"{key}={params[key]}".encode('ascii') for key in sorted(params)]
+        body = method.encode('ascii') + b"?" + b"&".join(parts) + self._secret_tail
+
         # Calculate SHA512 hash
-        signature = hashlib.sha512(signature_string.encode('utf-8')).hexdigest()
-        
+        signature = hashlib.sha512(body).hexdigest()
+
         # Add signature to parameters
         params["apiSig"] = f"123456{signature}"
-        
+
         return params
 
-    def call_api(self, method: str, params: Optional[Dict[str, str]] = None) -> Dict:
-        """Make an authenticated call to the Codeforces API"""
+    @staticmethod
+    def _cache_key(method: str, params: Dict[str, str]) -> str:
+        """Build a stable cache key for an API method + parameters.
+
+        Python's hash() is randomized per interpreter start, so it can never
+        hit across invocations. Volatile auth parameters are excluded so
+        signed and unsigned calls to the same method share a key.
+        """
+        stable = sorted((k, str(v)) for k, v in params.items()
+                        if k not in ("time", "rand", "apiSig"))
+        payload = json.dumps([method, stable], separators=(',', ':'))
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def call_api(self, method: str, params: Optional[Dict[str, str]] = None,
+                 quiet: bool = False) -> Dict:
+        """Make an authenticated call to the Codeforces API.
+
+        With quiet=True nothing is printed and no retries are attempted:
+        errors just propagate. Used by the background prefetch, which must
+        not write into a foreground command's terminal.
+        """
         if params is None:
             params = {}
 
-        cache_key = f"{method}_{hash(frozenset(params.items()))}"
+        cache_key = self._cache_key(method, params)
         cached_data = self._get_from_cache(cache_key)
-        
+
         if cached_data:
             return cached_data
 
-        url = urljoin(CF_API_BASE, method)
+        # TTL expired (or nothing cached); keep any stale entry around so
+        # the server can answer 304 instead of resending the full payload
+        stale = self._get_stale_from_cache(cache_key)
+
+        # Plain concatenation: the base ends in '/' and API method names
+        # never contain '?' or '#', so full URL resolution buys nothing
+        url = CF_API_BASE + method
         
         if self.is_authenticated() and method != "user.info":  # user.info is used to verify credentials
             auth_params = self.api_auth_params()
             params.update(auth_params)
             params = self.sign_request(method, params)
 
-        try:
-            response = self.session.get(url, params=params)
+        headers = {}
+        if stale:
+            if stale[1]:
+                headers["If-None-Match"] = stale[1]
+            if stale[2]:
+                headers["If-Modified-Since"] = stale[2]
+
+        def fetch():
+            response = self.session.get(url, params=params, headers=headers)
             response.raise_for_status()
-            data = response.json()
-            
+            return response
+
+        try:
+            response = fetch() if quiet else self._retry_with_backoff(fetch)
+
+            if response.status_code == 304 and stale:
+                # Nothing changed server-side; renew the TTL and skip the parse
+                self._touch_cache(cache_key)
+                return stale[0]
+
+            # orjson decodes straight from bytes, skipping the .text pass
+            data = orjson.loads(response.content)
+
             if data.get("status") == "OK":
-                self._save_to_cache(cache_key, data)
+                if method == "contest.list" and isinstance(data.get("result"), list):
+                    data["result"] = _bucket_contests(data["result"])
+                self._save_to_cache(cache_key, data,
+                                    response.headers.get("ETag"),
+                                    response.headers.get("Last-Modified"))
                 return data
             else:
                 raise Exception(f"API Error: {data.get('comment', 'Unknown error')}")
         except requests.RequestException as e:
-            print(f"{Fore.RED}Network error: {e}{Style.RESET_ALL}")
-            self._retry_with_backoff(lambda: self.call_api(method, params))
+            if not quiet:
+                print(f"{Fore.RED}Network error: {e}{Style.RESET_ALL}")
+            raise
         except Exception as e:
-            print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
+            if not quiet:
+                print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
             raise
 
     def web_login(self) -> bool:
@@ -135,14 +293,13 @@ class CFSession:
             response.raise_for_status()
             
             # Extract CSRF token
-            csrf_pattern = r'name="X-Csrf-Token" content="([^"]+)"'
-            match = re.search(csrf_pattern, response.text)
-            
-            if not match:
+            csrf_token = _extract_csrf(response.content)
+
+            if not csrf_token:
                 print(f"{Fore.RED}Could not extract CSRF token.{Style.RESET_ALL}")
                 return False
-                
-            self.csrf_token = match.group(1)
+
+            self.csrf_token = csrf_token
             
             # Now login
             login_data = {
@@ -151,7 +308,7 @@ class CFSession:
                 "csrf_token": self.csrf_token
             }
             
-            login_url = urljoin(CF_BASE_URL, "enter")
+            login_url = CF_BASE_URL + "enter"
             response = self.session.post(login_url, data=login_data)
             
             if "Invalid handle/email or password" in response.text:
@@ -167,53 +324,115 @@ class CFSession:
 
     def _get_from_cache(self, key: str) -> Optional[Dict]:
         """Get data from cache if valid"""
-        cache_file = CACHE_DIR / f"{key}.json"
-        if not cache_file.exists():
+        try:
+            row = self._cache_db.execute(
+                "SELECT blob FROM kv WHERE key=? AND ts>?",
+                (key, int(time.time()) - CACHE_TTL)
+            ).fetchone()
+        except sqlite3.Error:
             return None
-            
-        # Check if cache is still valid
-        file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-        if datetime.now() - file_time > timedelta(seconds=CACHE_TTL):
+        if row is None:
             return None
-            
         try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            return orjson.loads(zlib.decompress(row[0]))
+        except (zlib.error, orjson.JSONDecodeError):
+            return None
+
+    def _get_stale_from_cache(self, key: str) -> Optional[Tuple[Dict, Optional[str], Optional[str]]]:
+        """Get an expired cache entry with its HTTP validators, if any.
+
+        Used to revalidate with If-None-Match/If-Modified-Since after the
+        TTL lapses; a 304 means the stale data is still current.
+        """
+        try:
+            row = self._cache_db.execute(
+                "SELECT blob, etag, last_modified FROM kv WHERE key=?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            return orjson.loads(zlib.decompress(row[0])), row[1], row[2]
+        except (sqlite3.Error, zlib.error, orjson.JSONDecodeError):
             return None
 
-    def _save_to_cache(self, key: str, data: Dict) -> None:
+    def _touch_cache(self, key: str) -> None:
+        """Refresh a cache entry's timestamp without rewriting its payload"""
+        try:
+            self._cache_db.execute("UPDATE kv SET ts=? WHERE key=?", (int(time.time()), key))
+        except sqlite3.Error:
+            pass
+
+    def _save_to_cache(self, key: str, data: Dict,
+                       etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
         """Save data to cache"""
-        cache_file = CACHE_DIR / f"{key}.json"
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
-        except IOError:
+            self._cache_db.execute(
+                "INSERT OR REPLACE INTO kv(key, ts, blob, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+                (key, int(time.time()), zlib.compress(orjson.dumps(data), 1), etag, last_modified)
+            )
+        except sqlite3.Error:
             print(f"{Fore.YELLOW}Warning: Could not cache data.{Style.RESET_ALL}")
 
-    def _retry_with_backoff(self, func, max_retries=3, base_delay=1):
-        """Retry a function with exponential backoff"""
+    def was_submitted(self, contest_id: int, problem_index: str, source_hash: str) -> bool:
+        """Check whether this exact source was already submitted to the problem"""
+        try:
+            row = self._cache_db.execute(
+                "SELECT 1 FROM submitted WHERE cid=? AND idx=? AND h=?",
+                (contest_id, problem_index, source_hash)
+            ).fetchone()
+            return row is not None
+        except sqlite3.Error:
+            return False
+
+    def record_submission(self, contest_id: int, problem_index: str, source_hash: str) -> None:
+        """Remember a submitted source hash for duplicate detection"""
+        try:
+            self._cache_db.execute(
+                "INSERT OR IGNORE INTO submitted(cid, idx, h) VALUES (?, ?, ?)",
+                (contest_id, problem_index, source_hash)
+            )
+        except sqlite3.Error:
+            pass
+
+    def _retry_with_backoff(self, func, max_retries=3, base_delay=1.0, cap=30.0):
+        """Retry a function with jittered exponential backoff on network errors"""
         for attempt in range(max_retries):
-            delay = base_delay * (2 ** attempt)
-            print(f"{Fore.YELLOW}Retrying in {delay} seconds... (Attempt {attempt+1}/{max_retries}){Style.RESET_ALL}")
-            time.sleep(delay)
-            
             try:
                 return func()
-            except Exception as e:
+            except requests.RequestException:
                 if attempt == max_retries - 1:
                     print(f"{Fore.RED}Max retries reached. Giving up.{Style.RESET_ALL}")
                     raise
+                delay = min(cap, base_delay * (2 ** attempt)) * (1 + random.uniform(0, 0.5))
+                print(f"{Fore.YELLOW}Retrying in {delay:.1f} seconds... (Attempt {attempt+1}/{max_retries}){Style.RESET_ALL}")
+                time.sleep(delay)
 
 
 # Initialize global session
 cf_session = CFSession()
 
+# Handle of the startup prefetch thread, joined by commands that use contest.list
+_prefetch_thread = None
+
+
+def _prefetch_contest_list():
+    """Warm the contest.list cache; failures are left for the command to surface"""
+    try:
+        cf_session.call_api("contest.list", quiet=True)
+    except Exception:
+        pass
+
 
 @click.group()
-def cli():
+@click.pass_context
+def cli(ctx):
     """Codeforces CLI - Automate your CP workflow"""
-    pass
+    # Overlap the contest.list fetch with command startup; on a warm cache
+    # this returns immediately. login rewrites the credentials the signer
+    # reads, so it must not race a concurrent signed call
+    global _prefetch_thread
+    if ctx.invoked_subcommand != 'login':
+        _prefetch_thread = threading.Thread(target=_prefetch_contest_list, daemon=True)
+        _prefetch_thread.start()
 
 
 @cli.command()
@@ -229,6 +448,7 @@ def login(handle, key, secret):
     cf_session.handle = handle
     cf_session.api_key = key
     cf_session.api_secret = secret
+    cf_session._secret_tail = ("#" + secret).encode('ascii')
     
     # Validate credentials with a test API call
     try:
@@ -252,29 +472,28 @@ def fetch(type, limit):
     if not cf_session.is_authenticated():
         print(f"{Fore.YELLOW}Not authenticated. Using public API access.{Style.RESET_ALL}")
     
+    # Let the startup prefetch finish populating the cache first
+    if _prefetch_thread is not None:
+        _prefetch_thread.join(timeout=2.0)
+
     try:
         response = cf_session.call_api("contest.list")
-        contests = response.get("result", [])
-        
-        # Filter contests based on type
-        current_time = int(time.time())
-        filtered_contests = []
-        
-        for contest in contests:
-            if type == 'upcoming' and contest.get('phase') == 'BEFORE':
-                filtered_contests.append(contest)
-            elif type == 'running' and contest.get('phase') == 'CODING':
-                filtered_contests.append(contest)
-            elif type == 'past' and contest.get('phase') == 'FINISHED':
-                filtered_contests.append(contest)
-        
-        # Sort and limit
-        if type == 'upcoming':
-            filtered_contests.sort(key=lambda c: c.get('startTimeSeconds', 0))
+        result = response.get("result", {})
+        phase = _PHASE_BY_TYPE[type]
+
+        if isinstance(result, dict):
+            # Buckets are pre-sorted at cache time; selection is one slice
+            filtered_contests = result.get(phase, [])[:limit]
         else:
-            filtered_contests.sort(key=lambda c: c.get('startTimeSeconds', 0), reverse=True)
-        
-        filtered_contests = filtered_contests[:limit]
+            # Cache rows written before bucketing hold the raw contest
+            # list; a bounded heap picks the top entries in O(N log limit)
+            # instead of sorting thousands of contests to keep a handful
+            filtered_contests = [c for c in result if c.get('phase') == phase]
+            key = lambda c: c.get('startTimeSeconds', 0)
+            if type == 'upcoming':
+                filtered_contests = heapq.nsmallest(limit, filtered_contests, key=key)
+            else:
+                filtered_contests = heapq.nlargest(limit, filtered_contests, key=key)
         
         # Display contests
         if not filtered_contests:
@@ -282,20 +501,67 @@ def fetch(type, limit):
             return
         
         print(f"\n{Fore.CYAN}== {type.capitalize()} Contests =={Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'ID':<8} {'Name':<50} {'Start Time':<25} {'Duration'}{Style.RESET_ALL}")
+        print(_FETCH_HEADER)
         print("-" * 90)
-        
+
         for contest in filtered_contests:
-            start_time = datetime.fromtimestamp(contest.get('startTimeSeconds', 0))
+            # The :<50.50 spec pads and truncates in one step
+            name = contest.get('name', 'Unknown')
+            start = datetime.fromtimestamp(contest.get('startTimeSeconds', 0)).strftime('%Y-%m-%d %H:%M:%S')
             duration_mins = contest.get('durationSeconds', 0) // 60
-            duration_str = f"{duration_mins // 60}h {duration_mins % 60}m"
-            
-            print(f"{contest.get('id', 'N/A'):<8} {contest.get('name', 'Unknown')[:47]+'...' if len(contest.get('name', '')) > 50 else contest.get('name', 'Unknown'):<50} {start_time.strftime('%Y-%m-%d %H:%M:%S'):<25} {duration_str}")
+            print(f"{contest.get('id', 'N/A'):<8} {name:<50.50} {start:<25} {duration_mins // 60}h {duration_mins % 60}m")
         
     except Exception as e:
         print(f"{Fore.RED}Error fetching contests: {e}{Style.RESET_ALL}")
 
 
+# Header prepended to every generated file; formatted once per problem
+_HEADER_TMPL = "/**\n * Problem: Codeforces {cid}{idx}\n * URL: {url}\n * Date: {date}\n */\n\n"
+
+# Template written on first use when the user has none of their own
+_DEFAULT_TEMPLATE = """#include <iostream>
+#include <vector>
+#include <algorithm>
+#include <string>
+#include <map>
+#include <set>
+
+using namespace std;
+
+void solve() {
+    // Your solution here
+}
+
+int main() {
+    ios_base::sync_with_stdio(false);
+    cin.tie(nullptr);
+
+    int t = 1;
+    // cin >> t;
+    while (t--) {
+        solve();
+    }
+
+    return 0;
+}
+"""
+
+
+def _emit_file(contest_id: int, problem_index: str, template_content: bytes, today: str) -> None:
+    """Write one ContestXXXX_Y.cpp file from the already-loaded template"""
+    output_filename = f"Contest{contest_id}_{problem_index}.cpp"
+    problem_url = f"https://codeforces.com/contest/{contest_id}/problem/{problem_index}"
+
+    header = _HEADER_TMPL.format(cid=contest_id, idx=problem_index, url=problem_url, date=today)
+    # Two buffered writes; no throwaway header+template concatenation
+    with open(output_filename, 'wb') as dest:
+        dest.write(header.encode())
+        dest.write(template_content)
+
+    print(f"{Fore.GREEN}Created {output_filename} successfully!{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Problem URL: {problem_url}{Style.RESET_ALL}")
+
+
 @cli.command()
 @click.argument('contest_id')
 @click.argument('problem_index', required=False)
@@ -318,37 +584,25 @@ def generate(contest_id, problem_index, template_dir, all):
         template_path.mkdir(parents=True, exist_ok=True)
 
     template_file = template_path / "template.cpp"
-    
-    # Create default template if it doesn't exist
-    if not template_file.exists():
-        print(f"{Fore.YELLOW}Template file not found. Creating a basic template...{Style.RESET_ALL}")
-        with open(template_file, 'w') as f:
-            f.write("""#include <iostream>
-#include <vector>
-#include <algorithm>
-#include <string>
-#include <map>
-#include <set>
-
-using namespace std;
 
-void solve() {
-    // Your solution here
-}
+    # Read the template once, in binary: the bytes are copied verbatim
+    # into each output file, so decoding them would be wasted work. A
+    # single open replaces the exists()/stat()/open() triple
+    try:
+        template_content = template_file.read_bytes()
+    except FileNotFoundError:
+        print(f"{Fore.YELLOW}Template file not found. Creating a basic template...{Style.RESET_ALL}")
+        template_content = _DEFAULT_TEMPLATE.encode()
+        try:
+            template_file.write_bytes(template_content)
+        except IOError as e:
+            print(f"{Fore.RED}Error writing template: {e}{Style.RESET_ALL}")
+            return
+    except IOError as e:
+        print(f"{Fore.RED}Error reading template: {e}{Style.RESET_ALL}")
+        return
 
-int main() {
-    ios_base::sync_with_stdio(false);
-    cin.tie(nullptr);
-    
-    int t = 1;
-    // cin >> t;
-    while (t--) {
-        solve();
-    }
-    
-    return 0;
-}
-""")
+    today = datetime.now().strftime('%Y-%m-%d')
 
     if all:
         # Fetch contest problems
@@ -370,47 +624,36 @@ int main() {
                 return
                 
             print(f"{Fore.CYAN}Generating files for {len(problems)} problems in contest {contest_id}...{Style.RESET_ALL}")
-            
+
+            # Resolve overwrite prompts synchronously before dispatching, so
+            # the pool only performs writes
+            indices = []
             for problem in problems:
                 problem_index = problem.get("index")
                 if not problem_index:
                     continue
-                    
-                # Create output file
+
                 output_filename = f"Contest{contest_id}_{problem_index}.cpp"
-                output_path = Path(output_filename)
-                
-                # Check if file already exists
-                if output_path.exists():
+                if Path(output_filename).exists():
                     overwrite = input(f"{Fore.YELLOW}File {output_filename} already exists. Overwrite? (y/N): {Style.RESET_ALL}")
                     if overwrite.lower() != 'y':
                         print(f"{Fore.YELLOW}Skipping {output_filename}{Style.RESET_ALL}")
                         continue
-                
-                # Generate problem URL
-                problem_url = f"https://codeforces.com/contest/{contest_id}/problem/{problem_index}"
-                
+
+                indices.append(problem_index)
+
+            if not indices:
+                return
+
+            def emit(problem_index):
                 try:
-                    # Read template
-                    with open(template_file, 'r') as src:
-                        template_content = src.read()
-                    
-                    # Add header with problem URL
-                    header = f"""/**
- * Problem: Codeforces {contest_id}{problem_index}
- * URL: {problem_url}
- * Date: {datetime.now().strftime('%Y-%m-%d')}
- */
-"""
-                    # Write to output file
-                    with open(output_filename, 'w') as dest:
-                        dest.write(header + "\n" + template_content)
-                    
-                    print(f"{Fore.GREEN}Created {output_filename} successfully!{Style.RESET_ALL}")
-                    print(f"{Fore.CYAN}Problem URL: {problem_url}{Style.RESET_ALL}")
-                    
+                    _emit_file(contest_id, problem_index, template_content, today)
                 except Exception as e:
-                    print(f"{Fore.RED}Error generating file {output_filename}: {e}{Style.RESET_ALL}")
+                    print(f"{Fore.RED}Error generating file Contest{contest_id}_{problem_index}.cpp: {e}{Style.RESET_ALL}")
+
+            # Independent writes are embarrassingly parallel I/O
+            with ThreadPoolExecutor(max_workers=min(8, len(indices))) as executor:
+                list(executor.map(emit, indices))
                     
         except Exception as e:
             print(f"{Fore.RED}Error fetching contest problems: {e}{Style.RESET_ALL}")
@@ -423,7 +666,7 @@ int main() {
             return
             
         problem_index = problem_index.upper()
-        if not re.match(r'^[A-Z][0-9]?$', problem_index):
+        if not _PROBIDX_RE.match(problem_index):
             print(f"{Fore.RED}Problem index must be a letter optionally followed by a number (e.g., A, B, C1).{Style.RESET_ALL}")
             return
 
@@ -438,28 +681,8 @@ int main() {
                 print(f"{Fore.YELLOW}Operation cancelled.{Style.RESET_ALL}")
                 return
 
-        # Generate problem URL
-        problem_url = f"https://codeforces.com/contest/{contest_id}/problem/{problem_index}"
-        
         try:
-            # Read template
-            with open(template_file, 'r') as src:
-                template_content = src.read()
-            
-            # Add header with problem URL
-            header = f"""/**
- * Problem: Codeforces {contest_id}{problem_index}
- * URL: {problem_url}
- * Date: {datetime.now().strftime('%Y-%m-%d')}
- */
-"""
-            # Write to output file
-            with open(output_filename, 'w') as dest:
-                dest.write(header + "\n" + template_content)
-            
-            print(f"{Fore.GREEN}Created {output_filename} successfully!{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}Problem URL: {problem_url}{Style.RESET_ALL}")
-            
+            _emit_file(contest_id, problem_index, template_content, today)
         except Exception as e:
             print(f"{Fore.RED}Error generating file: {e}{Style.RESET_ALL}")
 
@@ -476,7 +699,7 @@ def submit(filename):
         return
     
     # Extract contest ID and problem index from filename
-    match = re.match(r'Contest(\d+)_([A-Z][0-9]?)\.cpp', file_path.name)
+    match = _FILENAME_RE.match(file_path.name)
     if not match:
         print(f"{Fore.YELLOW}Filename doesn't follow the expected pattern 'Contest{contest_id}_{problem_index}.cpp'.{Style.RESET_ALL}")
         contest_id = click.prompt("Enter contest ID", type=int)
@@ -485,6 +708,20 @@ def submit(filename):
         contest_id = int(match.group(1))
         problem_index = match.group(2)
     
+    # Read source code
+    try:
+        source_bytes = file_path.read_bytes()
+    except Exception as e:
+        print(f"{Fore.RED}Error reading file: {e}{Style.RESET_ALL}")
+        return
+
+    # Codeforces rejects resubmissions of identical code; catching them
+    # locally skips the whole login + upload round trip
+    source_hash = hashlib.blake2b(source_bytes, digest_size=16).hexdigest()
+    if cf_session.was_submitted(contest_id, problem_index, source_hash):
+        print(f"{Fore.YELLOW}Warning: You have submitted exactly the same code before. Not submitting.{Style.RESET_ALL}")
+        return
+
     # Ensure we're logged in to the website
     if not cf_session.logged_in:
         print(f"{Fore.CYAN}Logging in to Codeforces...{Style.RESET_ALL}")
@@ -492,53 +729,49 @@ def submit(filename):
             print(f"{Fore.RED}Failed to log in to Codeforces website. Cannot submit.{Style.RESET_ALL}")
             return
     
-    # Read source code
-    try:
-        with open(file_path, 'r') as f:
-            source_code = f.read()
-    except Exception as e:
-        print(f"{Fore.RED}Error reading file: {e}{Style.RESET_ALL}")
-        return
-    
     # Prepare submission
-    submit_url = urljoin(CF_BASE_URL, f"contest/{contest_id}/submit")
+    submit_url = f"{CF_BASE_URL}contest/{contest_id}/submit"
     
     # Get CSRF token and cookies if needed
     if not cf_session.csrf_token:
         print(f"{Fore.CYAN}Getting CSRF token...{Style.RESET_ALL}")
         response = cf_session.session.get(submit_url)
-        csrf_pattern = r'name="X-Csrf-Token" content="([^"]+)"'
-        match = re.search(csrf_pattern, response.text)
-        if not match:
+        csrf_token = _extract_csrf(response.content)
+        if not csrf_token:
             print(f"{Fore.RED}Could not extract CSRF token.{Style.RESET_ALL}")
             return
-        cf_session.csrf_token = match.group(1)
+        cf_session.csrf_token = csrf_token
     
-    # Prepare form data
+    # Prepare form data; the source goes as a multipart file part so the
+    # body is raw bytes instead of a percent-encoded form field
     submit_data = {
         "csrf_token": cf_session.csrf_token,
         "action": "submitSolutionFormSubmitted",
         "submittedProblemIndex": problem_index,
         "programTypeId": "54",  # ID for C++17
-        "source": source_code,
-        "tabSize": "4",
-        "sourceFile": ""
+        "source": "",
+        "tabSize": "4"
     }
-    
+    submit_files = {
+        "sourceFile": (file_path.name, source_bytes, "text/x-c++src")
+    }
+
     try:
         print(f"{Fore.CYAN}Submitting solution to problem {problem_index} in contest {contest_id}...{Style.RESET_ALL}")
-        response = cf_session.session.post(submit_url, data=submit_data)
+        response = cf_session.session.post(submit_url, data=submit_data, files=submit_files)
         
         if "You have submitted exactly the same code" in response.text:
             print(f"{Fore.YELLOW}Warning: You have submitted exactly the same code before.{Style.RESET_ALL}")
+            cf_session.record_submission(contest_id, problem_index, source_hash)
             return
-        
+
         # Check if submission was successful
         if f"contest/{contest_id}/my" in response.url:
             print(f"{Fore.GREEN}Solution submitted successfully!{Style.RESET_ALL}")
+            cf_session.record_submission(contest_id, problem_index, source_hash)
             
             # Extract submission ID for status checking
-            match = re.search(r'submissionId="(\d+)"', response.text)
+            match = _SUBID_RE.search(response.text)
             if match:
                 submission_id = match.group(1)
                 print(f"{Fore.CYAN}Submission ID: {submission_id}{Style.RESET_ALL}")
@@ -570,28 +803,39 @@ def status(submission_id, contest_id):
     try:
         if submission_id:
             # Check status for a specific submission
-            url = urljoin(CF_BASE_URL, f"data/submitSource")
+            url = CF_BASE_URL + "data/submitSource"
             params = {"submissionId": submission_id}
             
             print(f"{Fore.CYAN}Checking status for submission {submission_id}...{Style.RESET_ALL}")
             
-            # Polling with delay
+            # Poll with jittered exponential backoff instead of a fixed
+            # 2s sleep: quick verdicts print sooner, slow ones poll less
             max_attempts = 10
+            etag = None
             for attempt in range(max_attempts):
-                response = cf_session.session.get(url, params=params)
-                
+                headers = {"If-None-Match": etag} if etag else {}
+                response = cf_session.session.get(url, params=params, headers=headers)
+
+                if response.status_code == 304:
+                    # Unchanged since last poll; skip the JSON parse
+                    delay = min(5.0, 0.5 * (2 ** attempt)) * (1 + random.uniform(-0.25, 0.25))
+                    time.sleep(delay)
+                    continue
+
                 if response.status_code != 200:
                     print(f"{Fore.RED}Error: HTTP {response.status_code}{Style.RESET_ALL}")
                     break
-                
+
+                etag = response.headers.get("ETag")
                 data = response.json()
                 verdict = data.get("verdict")
-                
+
                 if verdict in ["TESTING", ""]:
                     dots = "." * (attempt + 1)
                     sys.stdout.write(f"\r{Fore.YELLOW}Verdict: In queue{dots}{' ' * 10}{Style.RESET_ALL}")
                     sys.stdout.flush()
-                    time.sleep(2)
+                    delay = min(5.0, 0.5 * (2 ** attempt)) * (1 + random.uniform(-0.25, 0.25))
+                    time.sleep(delay)
                     continue
                 
                 print("")  # Newline after progress dots
@@ -616,7 +860,7 @@ def status(submission_id, contest_id):
         
         else:
             # Check all submissions for a contest
-            url = urljoin(CF_BASE_URL, f"contest/{contest_id}/my")
+            url = f"{CF_BASE_URL}contest/{contest_id}/my"
             response = cf_session.session.get(url)
             
             if "You are not registered" in response.text:
@@ -624,8 +868,7 @@ def status(submission_id, contest_id):
                 return
             
             # Parse submissions table
-            submissions_pattern = r'data-submission-id="(\d+)".*?data-problemId="\d+".*?data-problemIndex="([^"]+)".*?submissionVerdict="([^"]*)"'
-            submissions = re.findall(submissions_pattern, response.text, re.DOTALL)
+            submissions = _parse_submissions(response.text)
             
             if not submissions:
                 print(f"{Fore.YELLOW}No submissions found for contest {contest_id}.{Style.RESET_ALL}")
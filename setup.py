@@ -9,8 +9,10 @@ setup(
     install_requires=[
         "click",
         "colorama",
+        "orjson",
         "python-dotenv",
         "requests",
+        "selectolax",
     ],
     entry_points={
         "console_scripts": [